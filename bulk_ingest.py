@@ -1,10 +1,10 @@
 import argparse
 import os
-from typing import List
+from typing import Dict, List, Tuple
 
 import lancedb
 from utils.db import connect_lancedb
-from docling.document_converter import DocumentConverter
+from utils.conversion import PROFILES, AdaptiveConverter, parse_profile_overrides
 from docling.chunking import HybridChunker
 from lancedb.embeddings import get_registry
 from lancedb.pydantic import LanceModel, Vector
@@ -12,12 +12,56 @@ from utils.tokenizer import OpenAITokenizerWrapper
 from dotenv import load_dotenv
 
 
+def parse_override(spec: str) -> Tuple[str, Dict[int, str]]:
+    fname, sep, pages = spec.partition(":")
+    if not sep or not fname:
+        raise argparse.ArgumentTypeError(f"expected FILE:RANGES=PROFILE, got {spec!r}")
+    try:
+        return fname, parse_profile_overrides(pages)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def non_negative_int(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or greater, got {number}")
+    return number
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Bulk ingest PDFs into LanceDB")
     parser.add_argument("input_dir", help="Directory containing PDF files")
     parser.add_argument("db_path", help="Path to LanceDB database")
     parser.add_argument("--table", default="docling", help="LanceDB table name")
-    return parser.parse_args()
+    parser.add_argument(
+        "--profile",
+        choices=["auto", *PROFILES],
+        default="auto",
+        help="Conversion profile; auto skips OCR and heavy table models for born-digital pages",
+    )
+    parser.add_argument(
+        "--override",
+        action="append",
+        default=[],
+        type=parse_override,
+        metavar="FILE:RANGES=PROFILE",
+        help='Force a profile for pages of one file, e.g. "report.pdf:1-3=full;10=tables"',
+    )
+    parser.add_argument(
+        "--calibrate-pages",
+        type=non_negative_int,
+        default=0,
+        help="Born-digital pages to also convert with the full profile to measure time saved",
+    )
+    args = parser.parse_args()
+
+    # Repeated overrides for the same file are merged, later ones winning per page
+    overrides: Dict[str, Dict[int, str]] = {}
+    for fname, pages in args.override:
+        overrides.setdefault(fname, {}).update(pages)
+    args.override = overrides
+    return args
 
 
 class ChunkMetadata(LanceModel):
@@ -52,19 +96,21 @@ def main():
 
         table = db.create_table(args.table, schema=TableSchema, mode="create")
 
-    converter = DocumentConverter()
+    converter = AdaptiveConverter(profile=args.profile, calibration_pages=args.calibrate_pages)
+    total_saved = 0.0
+    measured_docs = 0
     tokenizer = OpenAITokenizerWrapper()
     chunker = HybridChunker(tokenizer=tokenizer, max_tokens=tokenizer.model_max_length, merge_peers=True)
 
     pdf_files = [f for f in os.listdir(args.input_dir) if f.lower().endswith(".pdf")]
+    for fname in sorted(set(args.override) - set(pdf_files)):
+        print(f"Warning: override given for {fname}, which is not in {args.input_dir}")
 
     for fname in pdf_files:
         path = os.path.join(args.input_dir, fname)
         try:
-            result = converter.convert(path)
-            if not result.document:
-                continue
-            chunks = list(chunker.chunk(result.document))
+            document, report = converter.convert(path, name=fname, overrides=args.override.get(fname))
+            chunks = list(chunker.chunk(document))
         except Exception as e:
             print(f"Failed processing {fname}: {e}")
             continue
@@ -81,7 +127,20 @@ def main():
             for c in chunks
         ]
         table.add(records)
+        if report.seconds_saved is not None:
+            total_saved += report.seconds_saved
+            measured_docs += 1
         print(f"Ingested {len(records)} chunks from {fname}")
+        print(f"  {report.summary()}")
+
+    if not measured_docs:
+        print("Conversion time saved: n/a (pass --calibrate-pages to measure a baseline)")
+    else:
+        # Documents converted before a baseline existed have no estimate
+        print(
+            f"Estimated conversion time saved: {total_saved:.1f}s "
+            f"over {measured_docs} of {len(pdf_files)} documents"
+        )
 
 
 if __name__ == "__main__":
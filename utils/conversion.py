@@ -0,0 +1,447 @@
+import time
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple, Union
+
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+from docling.datamodel.base_models import DocumentStream, InputFormat
+from docling.datamodel.pipeline_options import PdfPipelineOptions, TableFormerMode
+from docling.document_converter import DocumentConverter, PdfFormatOption
+from docling_core.types.doc import DoclingDocument
+
+FAST = "fast"
+TABLES = "tables"
+FULL = "full"
+# Ordered from cheapest to most expensive
+PROFILES = (FAST, TABLES, FULL)
+
+# A page needs OCR if it has almost no text layer, or if scanned images cover most of it
+MIN_CHARS_PER_PAGE = 50
+MAX_IMAGE_COVERAGE = 0.5
+# Thin horizontal/vertical paths are table rules; charts and logos are mostly curves and fills
+MAX_RULE_THICKNESS = 2.0
+MIN_RULE_LENGTH = 20.0
+MIN_RULES_PER_PAGE = 8
+# Born-digital runs shorter than this are merged into a neighbour to save extra conversions
+MIN_SEGMENT_PAGES = 3
+# Scanned and stamped PDFs often wrap the whole page in (nested) Form XObjects
+MAX_FORM_DEPTH = 15
+
+Segment = Tuple[str, int, int]
+
+
+@dataclass
+class PageProfile:
+    """Cheap pre-flight measurements for a single PDF page."""
+
+    page_no: int
+    char_count: int
+    image_coverage: float
+    rule_count: int
+
+    @property
+    def profile(self) -> str:
+        """Picks the cheapest profile that handles this page.
+
+        Only pages without a usable text layer (little text, or mostly covered by
+        images) get the full profile with OCR. Born-digital pages with many ruling
+        lines get the tables profile, which keeps OCR off and only switches
+        TableFormer to accurate mode. Everything else gets the fast profile.
+        """
+        if self.char_count < MIN_CHARS_PER_PAGE or self.image_coverage > MAX_IMAGE_COVERAGE:
+            return FULL
+        if self.rule_count >= MIN_RULES_PER_PAGE:
+            return TABLES
+        return FAST
+
+
+@dataclass
+class ConversionReport:
+    """Timing summary for one converted document.
+
+    `seconds` covers classification and conversion but not model loading.
+    `baseline_seconds` is only set once the baseline (full profile) rate has been
+    measured on born-digital pages via calibration; otherwise savings are n/a.
+    """
+
+    name: str
+    segments: List[Segment]
+    classify_seconds: float
+    seconds: float
+    baseline_seconds: Optional[float] = None
+
+    @property
+    def seconds_saved(self) -> Optional[float]:
+        if self.baseline_seconds is None:
+            return None
+        return self.baseline_seconds - self.seconds
+
+    def summary(self) -> str:
+        ranges = ", ".join(f"{p} {a}-{b}" for p, a, b in self.segments)
+        if self.seconds_saved is None:
+            saved = "time saved n/a, no measured baseline"
+        else:
+            saved = f"~{self.seconds_saved:.1f}s saved vs. measured full-profile rate"
+        return (
+            f"{self.name}: [{ranges}] in {self.seconds:.1f}s "
+            f"(incl. {self.classify_seconds:.1f}s pre-flight; {saved})"
+        )
+
+
+def parse_page_ranges(spec: str) -> List[int]:
+    """Parses a page range spec such as "1-3,7" into 1-based page numbers.
+
+    Args:
+        spec: Comma separated pages or inclusive ranges
+
+    Returns:
+        Sorted list of page numbers.
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    pages = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        try:
+            first, last = int(start), int(end or start)
+        except ValueError:
+            raise ValueError(f"Invalid page range: {part!r}")
+        if first < 1 or last < first:
+            raise ValueError(f"Invalid page range: {part!r}")
+        pages.update(range(first, last + 1))
+    return sorted(pages)
+
+
+def parse_profile_overrides(spec: str) -> Dict[int, str]:
+    """Parses overrides such as "1-3=full;10=fast" into a page-to-profile mapping.
+
+    Args:
+        spec: Semicolon separated RANGES=PROFILE pairs
+
+    Returns:
+        Mapping of 1-based page number to profile.
+
+    Raises:
+        ValueError: If the spec is empty, malformed or names an unknown profile
+    """
+    overrides: Dict[int, str] = {}
+    for part in spec.split(";"):
+        part = part.strip()
+        if not part:
+            continue
+        ranges, sep, profile = part.rpartition("=")
+        profile = profile.strip()
+        if not sep or profile not in PROFILES:
+            raise ValueError(f"Invalid profile override: {part!r}")
+        pages = parse_page_ranges(ranges)
+        if not pages:
+            raise ValueError(f"Invalid profile override: {part!r}")
+        for page_no in pages:
+            overrides[page_no] = profile
+    if not overrides:
+        raise ValueError(f"Empty profile override: {spec!r}")
+    return overrides
+
+
+def _is_rule(left: float, bottom: float, right: float, top: float) -> bool:
+    width, height = right - left, top - bottom
+    thin, long = min(width, height), max(width, height)
+    return thin <= MAX_RULE_THICKNESS and long >= MIN_RULE_LENGTH
+
+
+def _page_objects(page):
+    """Yields (type, page-space bounds) for every image and path, including those in Form XObjects."""
+    # pdfium reports bounds of nested objects in form space, so compose the form matrices
+    form_matrices = []
+    for obj in page.get_objects(max_depth=MAX_FORM_DEPTH):
+        del form_matrices[obj.level:]
+        if obj.type == pdfium_c.FPDF_PAGEOBJ_FORM:
+            matrix = obj.get_matrix()
+            if form_matrices:
+                matrix = matrix.multiply(form_matrices[-1])
+            form_matrices.append(matrix)
+            continue
+        if obj.type not in (pdfium_c.FPDF_PAGEOBJ_IMAGE, pdfium_c.FPDF_PAGEOBJ_PATH):
+            continue
+        # pypdfium2 5.x renamed get_pos() to get_bounds()
+        bounds = obj.get_bounds() if hasattr(obj, "get_bounds") else obj.get_pos()
+        if form_matrices:
+            bounds = form_matrices[-1].on_rect(*bounds)
+        yield obj.type, bounds
+
+
+def classify_pdf(source: Union[str, bytes]) -> List[PageProfile]:
+    """Inspects the text layer, images and ruling lines of every page without rendering.
+
+    Args:
+        source: Path to a PDF file or its raw bytes
+
+    Returns:
+        One PageProfile per page, in page order.
+    """
+    pdf = pdfium.PdfDocument(source)
+    profiles = []
+    try:
+        for index in range(len(pdf)):
+            page = pdf[index]
+            textpage = None
+            try:
+                width, height = page.get_size()
+                textpage = page.get_textpage()
+                char_count = textpage.count_chars()
+
+                image_area = 0.0
+                rule_count = 0
+                for obj_type, (left, bottom, right, top) in _page_objects(page):
+                    if obj_type == pdfium_c.FPDF_PAGEOBJ_IMAGE:
+                        image_area += max(right - left, 0) * max(top - bottom, 0)
+                    elif _is_rule(left, bottom, right, top):
+                        rule_count += 1
+            finally:
+                if textpage is not None:
+                    textpage.close()
+                page.close()
+
+            page_area = width * height or 1.0
+            profiles.append(
+                PageProfile(
+                    page_no=index + 1,
+                    char_count=char_count,
+                    image_coverage=min(image_area / page_area, 1.0),
+                    rule_count=rule_count,
+                )
+            )
+    finally:
+        pdf.close()
+    return profiles
+
+
+def _group(profiles: List[Tuple[int, str]]) -> List[Segment]:
+    segments: List[Segment] = []
+    for page_no, profile in profiles:
+        if segments and segments[-1][0] == profile and segments[-1][2] == page_no - 1:
+            segments[-1] = (profile, segments[-1][1], page_no)
+        else:
+            segments.append((profile, page_no, page_no))
+    return segments
+
+
+def _smooth(segments: List[Segment]) -> List[Segment]:
+    # Pages only ever move from fast to tables, so this always terminates
+    while len(segments) > 1:
+        short = [
+            i
+            for i, (p, a, b) in enumerate(segments)
+            if p != FULL and b - a + 1 < MIN_SEGMENT_PAGES
+        ]
+        # Only merge with born-digital neighbours; OCR costs far more than an extra conversion
+        short = [
+            i
+            for i in short
+            if any(0 <= j < len(segments) and segments[j][0] != FULL for j in (i - 1, i + 1))
+        ]
+        if not short:
+            break
+        i = short[0]
+        profile, first, last = segments[i]
+        # Prefer a tables neighbour, then the shorter one, so the fewest pages change profile
+        neighbours = [
+            j for j in (i - 1, i + 1) if 0 <= j < len(segments) and segments[j][0] != FULL
+        ]
+        j = max(
+            neighbours,
+            key=lambda n: (PROFILES.index(segments[n][0]), segments[n][1] - segments[n][2]),
+        )
+        n_profile, n_first, n_last = segments[j]
+
+        if n_profile == TABLES:
+            # A short fast run is absorbed into its tables neighbour
+            upgraded = range(first, last + 1)
+        else:
+            # A short tables run only borrows enough fast pages to reach the minimum
+            need = MIN_SEGMENT_PAGES - (last - first + 1)
+            if j > i:
+                upgraded = range(last + 1, min(last + need, n_last) + 1)
+            else:
+                upgraded = range(max(first - need, n_first), first)
+
+        planned = {page_no: p for p, a, b in segments for page_no in range(a, b + 1)}
+        for page_no in upgraded:
+            planned[page_no] = TABLES
+        segments = _group(sorted(planned.items()))
+    return segments
+
+
+def plan_segments(
+    pages: List[PageProfile], overrides: Optional[Dict[int, str]] = None
+) -> List[Segment]:
+    """Groups consecutive pages sharing a profile into (profile, first, last) segments.
+
+    Born-digital runs shorter than MIN_SEGMENT_PAGES are merged into a fast or
+    tables neighbour, moving pages from fast to tables, which costs about the same
+    because TableFormer only runs on detected tables. Full (OCR) runs are never
+    merged, and smoothing never moves a page with a text layer into OCR.
+    Overrides are applied after smoothing and are always honoured.
+
+    Args:
+        pages: Output of classify_pdf
+        overrides: Optional mapping of page number to a forced profile
+
+    Returns:
+        Segments covering every page, in page order.
+    """
+    segments = _smooth(_group([(p.page_no, p.profile) for p in pages]))
+    if not overrides:
+        return segments
+    planned = {page_no: p for p, a, b in segments for page_no in range(a, b + 1)}
+    planned.update({k: v for k, v in overrides.items() if k in planned})
+    return _group(sorted(planned.items()))
+
+
+def build_converter(profile: str) -> DocumentConverter:
+    """Creates a DocumentConverter configured for the given profile.
+
+    The fast profile skips OCR and uses the lightweight TableFormer mode, the
+    tables profile skips OCR with accurate TableFormer, and the full profile
+    matches Docling's defaults (OCR and accurate TableFormer).
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown conversion profile: {profile}")
+
+    options = PdfPipelineOptions()
+    options.do_table_structure = True
+    options.do_ocr = profile == FULL
+    if profile == FAST:
+        options.table_structure_options.mode = TableFormerMode.FAST
+    else:
+        options.table_structure_options.mode = TableFormerMode.ACCURATE
+
+    return DocumentConverter(
+        format_options={InputFormat.PDF: PdfFormatOption(pipeline_options=options)}
+    )
+
+
+class AdaptiveConverter:
+    """Routes each PDF page range to a fast, tables or full Docling conversion profile."""
+
+    def __init__(self, profile: str = "auto", calibration_pages: int = 0):
+        """Initialize the converter.
+
+        Args:
+            profile: "auto" to classify every document, or a profile name to force it
+            calibration_pages: Born-digital pages to re-convert with the full profile
+                to measure a baseline rate for time-saved reporting (0 disables it)
+        """
+        if profile != "auto" and profile not in PROFILES:
+            raise ValueError(f"Unknown conversion profile: {profile}")
+        self.profile = profile
+        self.calibration_pages = calibration_pages
+        self._converters: Dict[str, DocumentConverter] = {}
+        self._baseline_seconds = 0.0
+        self._baseline_pages = 0
+
+    def _converter(self, profile: str) -> DocumentConverter:
+        if profile not in self._converters:
+            converter = build_converter(profile)
+            # Load the models now so their start-up cost stays out of the timings
+            converter.initialize_pipeline(InputFormat.PDF)
+            self._converters[profile] = converter
+        return self._converters[profile]
+
+    def _convert_range(
+        self, profile: str, source: Union[str, bytes], name: str, first: int, last: int
+    ):
+        if isinstance(source, bytes):
+            source = DocumentStream(name=name, stream=BytesIO(source))
+        return self._converter(profile).convert(source, page_range=(first, last))
+
+    def _calibrate(self, source: Union[str, bytes], name: str, segments: List[Segment]) -> None:
+        remaining = self.calibration_pages - self._baseline_pages
+        for profile, first, last in segments:
+            if remaining <= 0:
+                break
+            if profile == FULL:
+                continue
+            last = min(last, first + remaining - 1)
+            self._converter(FULL)
+            start = time.perf_counter()
+            self._convert_range(FULL, source, name, first, last)
+            self._baseline_seconds += time.perf_counter() - start
+            self._baseline_pages += last - first + 1
+            remaining -= last - first + 1
+
+    def convert(
+        self,
+        source: Union[str, bytes],
+        name: Optional[str] = None,
+        overrides: Optional[Dict[int, str]] = None,
+    ) -> Tuple[DoclingDocument, ConversionReport]:
+        """Converts a PDF, one Docling conversion per profile segment, merged into one document.
+
+        Args:
+            source: Path to a PDF file or its raw bytes
+            name: Filename to use when source is bytes
+            overrides: Optional mapping of page number to a forced profile
+
+        Returns:
+            Tuple of (DoclingDocument, ConversionReport).
+        """
+        name = name or (source if isinstance(source, str) else "document.pdf")
+
+        start = time.perf_counter()
+        pages = classify_pdf(source)
+        classify_seconds = time.perf_counter() - start
+
+        overrides = dict(overrides or {})
+        out_of_range = sorted(p for p in overrides if p > len(pages))
+        if out_of_range:
+            print(f"Warning: {name} has {len(pages)} pages; ignoring overrides for pages {out_of_range}")
+        if self.profile != "auto":
+            overrides = {p.page_no: self.profile for p in pages} | overrides
+        segments = plan_segments(pages, overrides)
+
+        # Warm every converter this document needs before the conversion timer starts
+        for profile, _, _ in segments:
+            self._converter(profile)
+
+        results = []
+        full_seconds = 0.0
+        start = time.perf_counter()
+        for profile, first, last in segments:
+            segment_start = time.perf_counter()
+            results.append(self._convert_range(profile, source, name, first, last))
+            if profile == FULL:
+                full_seconds += time.perf_counter() - segment_start
+        seconds = classify_seconds + time.perf_counter() - start
+
+        if len(results) == 1:
+            document = results[0].document
+        else:
+            document = DoclingDocument.concatenate([r.document for r in results])
+            document.name = results[0].document.name
+            document.origin = results[0].document.origin
+
+        if self.calibration_pages and self._baseline_pages < self.calibration_pages:
+            self._calibrate(source, name, segments)
+
+        baseline_seconds = None
+        if self._baseline_pages:
+            # Full segments were timed directly; the rest are costed at the baseline
+            # rate measured on born-digital pages, never on the expensive ones
+            rate = self._baseline_seconds / self._baseline_pages
+            other_pages = sum(b - a + 1 for p, a, b in segments if p != FULL)
+            baseline_seconds = full_seconds + other_pages * rate
+
+        report = ConversionReport(
+            name=name,
+            segments=segments,
+            classify_seconds=classify_seconds,
+            seconds=seconds,
+            baseline_seconds=baseline_seconds,
+        )
+        return document, report